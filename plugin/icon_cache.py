@@ -0,0 +1,150 @@
+import os
+import sys
+import time
+import atexit
+import sqlite3
+import logging
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import Union, Optional, Dict, Tuple
+
+CACHE_DIR = Path(os.getenv('LOCALAPPDATA') or tempfile.gettempdir()).joinpath('steam-search')
+ICONS_DIR = CACHE_DIR.joinpath('icons')
+ICON_DB = CACHE_DIR.joinpath('icons.db')
+SCHEMA_VERSION = 2  # Increment when the table layout changes
+MISSING_TTL = 7 * 24 * 60 * 60  # Seconds to remember that a game has no CDN icon
+
+logger = logging.getLogger(__name__)
+
+# Caches with an open database, flushed by a single exit hook without being kept alive by it
+_open_caches: "weakref.WeakSet[IconCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    """Flush every open cache from the interpreter's exit handlers, reporting failures without logging."""
+    for cache in list(_open_caches):
+        try:
+            cache.flush()
+        except Exception as e:
+            sys.stderr.write(f"Failed to save icon cache at exit: {e}\n")
+
+
+class IconCache:
+    """
+    Persistent {game_id: icon path} cache backed by SQLite.
+    Entries remember the icon file's mtime and are dropped once the file changes.
+    Games known to have no icon are stored without a path until they expire.
+    Writes are buffered and committed in a single batch by `flush`.
+    """
+
+    def __init__(self, path: Union[str, Path] = ICON_DB):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Tuple[Optional[str], Optional[float], str, Optional[float]]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            if self._conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                self._conn.execute('DROP TABLE IF EXISTS icons')
+                self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS icons ('
+                'game_id INTEGER PRIMARY KEY, path TEXT, mtime REAL, source TEXT, expires REAL)'
+            )
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Icon cache unavailable at {self.path}: {e}")
+            self._conn = None
+        else:
+            # Persist leftovers at a well-defined point of shutdown rather than from a finalizer
+            _open_caches.add(self)
+
+    def get(self, game_id: int) -> Optional[str]:
+        """Get cached icon path for a game, or None if missing or stale."""
+        with self._lock:
+            if game_id in self._pending:
+                path, mtime, _, _ = self._pending[game_id]
+            elif self._conn is None:
+                return None
+            else:
+                try:
+                    row = self._conn.execute(
+                        'SELECT path, mtime FROM icons WHERE game_id = ?', (game_id,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.debug(f"Icon cache lookup failed for {game_id}: {e}")
+                    return None
+                if row is None:
+                    return None
+                path, mtime = row
+        if not path:
+            return None
+        try:
+            if os.path.getmtime(path) != mtime:
+                return None
+        except OSError:
+            return None
+        return path
+
+    def is_missing(self, game_id: int) -> bool:
+        """Check whether a game was recently found to have no icon."""
+        with self._lock:
+            if game_id in self._pending:
+                path, _, _, expires = self._pending[game_id]
+            elif self._conn is None:
+                return False
+            else:
+                try:
+                    row = self._conn.execute(
+                        'SELECT path, expires FROM icons WHERE game_id = ?', (game_id,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.debug(f"Icon cache lookup failed for {game_id}: {e}")
+                    return False
+                if row is None:
+                    return False
+                path, expires = row
+        return path is None and expires is not None and expires > time.time()
+
+    def put(self, game_id: int, path: str, source: str) -> None:
+        """Queue an icon path for a game; persisted on the next `flush`."""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return
+        with self._lock:
+            self._pending[game_id] = (path, mtime, source, None)
+
+    def put_missing(self, game_id: int, source: str, ttl: float = MISSING_TTL) -> None:
+        """Queue a negative entry so the game is not looked up again for `ttl` seconds."""
+        with self._lock:
+            self._pending[game_id] = (None, None, source, time.time() + ttl)
+
+    def flush(self) -> None:
+        """Write all queued entries in one transaction."""
+        with self._lock:
+            if not self._pending or self._conn is None:
+                return
+            rows = [(game_id, *entry) for game_id, entry in self._pending.items()]
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        'INSERT OR REPLACE INTO icons (game_id, path, mtime, source, expires) VALUES (?, ?, ?, ?, ?)',
+                        rows
+                    )
+                self._pending.clear()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to save icon cache: {e}")
+
+    def close(self) -> None:
+        """Flush queued entries and close the database."""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        _open_caches.discard(self)
@@ -1,8 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Union, TYPE_CHECKING
+from typing import Optional, Union, List, TYPE_CHECKING
+import os
 import webbrowser
 import logging
+import threading
 from functools import cached_property
 if TYPE_CHECKING:
     from steam import Steam
@@ -17,14 +19,32 @@ log = logging.getLogger(__name__)
 class Library:
     steam: 'Steam'
     path: Union[str, Path]
+    _games_cache: Optional[list] = field(default=None, init=False, repr=False, compare=False)
+
+    def manifests(self) -> List[str]:
+        """
+        Return paths of the app manifests in this library, listed with a single scandir.
+        """
+        try:
+            with os.scandir(os.path.join(self.path, 'steamapps')) as entries:
+                return [
+                    entry.path for entry in entries
+                    if entry.name.startswith('appmanifest_') and entry.name.endswith('.acf')
+                ]
+        except OSError:
+            log.debug(f'Could not list library folder ("{self.path}")')
+            return []
 
     def games(self):
         """
         Return a list of games in this library.
+        Memoized; `Steam.refresh` discards it along with the library itself.
         """
+        if self._games_cache is not None:
+            return self._games_cache
         games = []
-        image_dir = LibraryImageDir(Path(self.steam.path).joinpath('appcache', 'librarycache'))
-        for appmanifest in Path(self.path).joinpath('steamapps').glob('appmanifest_*.acf'):
+        image_dir = self.steam.library_image_dir()
+        for appmanifest in self.manifests():
             try:
                 manifest = VDF(appmanifest)
             except FileNotFoundError:
@@ -53,33 +73,46 @@ class Library:
                 logging.debug(
                     f'Unable to parse game manifest ("{appmanifest}")')
                 continue
+        self._games_cache = games
         return games
 
 class LibraryImageDir:
     """
-    Caches the filesystem access of a library image directory
+    Caches the filesystem access of a library image directory.
+    Safe to share between threads; the directory listing is consumed under a lock.
     """
 
     def __init__(self, image_dir: Union[str, Path]):
         image_dir = Path(image_dir)
         self.grid = image_dir.name == 'grid'
         self._files_cache = {}
-        self._iterdir = image_dir.iterdir()
+        self._entries = self._scan(image_dir)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scan(image_dir: Path):
+        # scandir entries carry the file type, so skipping folders costs no extra stat
+        with os.scandir(image_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield entry
 
     def get_image(self, id: str, type: str, sep='_') -> Optional[Path]:
         prefix = f'{id}{sep}{type}'
-        try:
-            if prefix in self._files_cache:
-                return self._files_cache[prefix]
-            else:
-                for file in self._iterdir:
-                    haystack_prefix = file.name.split(".", 1)[0]
-                    self._files_cache[haystack_prefix] = file
-                    if prefix == haystack_prefix:
-                        return file
+        with self._lock:
+            try:
+                if prefix in self._files_cache:
+                    return self._files_cache[prefix]
+                else:
+                    for entry in self._entries:
+                        haystack_prefix = entry.name.partition(".")[0]
+                        file = Path(entry.path)
+                        self._files_cache[haystack_prefix] = file
+                        if prefix == haystack_prefix:
+                            return file
+                    return None
+            except FileNotFoundError:
                 return None
-        except FileNotFoundError:
-            return None
 
 
 class LibraryItem:
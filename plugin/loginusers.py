@@ -3,8 +3,9 @@ from pathlib import Path
 from typing import Union, TYPE_CHECKING
 from distutils.util import strtobool
 from collections import UserList
+import struct
 
-from .vdfs import VDF
+from .vdfs import VDF, BinaryVDF
 from .library import LibraryItem, LibraryImageDir
 if TYPE_CHECKING:
     from steam import Steam
@@ -68,19 +69,22 @@ class LoginUser:
         _list = []
         if not self.shortcuts_path.exists():
             return _list
-        with open(self.shortcuts_path, 'rb') as file:
-            _shortcuts = file.read()
-            # Steam Rom Manager sometimes uses lowercase...
-            _shortcuts = _shortcuts.replace(b'appname\x00', b'AppName\x00')
-        split = _shortcuts.split(b'AppName\x00')[1:]
-        if len(split) == 0:
+        try:
+            shortcuts = BinaryVDF(self.shortcuts_path)
+        except (SyntaxError, ValueError, struct.error):
+            return _list
+        # Top level key is "shortcuts", but its casing is not guaranteed
+        entries = next(iter(shortcuts.values()), None)
+        if not entries:
             return _list
         image_dir = LibraryImageDir(self.grid_path)
-        for shortcut in _shortcuts.split(b'AppName\x00')[1:]:
+        for shortcut in entries.values():
+            # Steam Rom Manager sometimes uses lowercase...
+            fields = {key.lower(): value for key, value in shortcut.items()}
             _list.append(
                 LibraryItem(
-                    name=shortcut.split(b'\x00')[0].decode('utf-8'),
-                    path=shortcut.split(b'\x00')[2].decode('utf-8'),
+                    name=fields.get('appname', ''),
+                    path=fields.get('exe', ''),
                     image_dir=image_dir
                 )
             )
@@ -92,6 +96,31 @@ class LoginUsers(UserList):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    @staticmethod
+    def _user(ID: str, steam_path: Union[str, Path], fields: dict) -> LoginUser:
+        # Parsed VDFs are shared between callers, so normalise a copy
+        fields = dict(fields)
+        if fields.get('mostrecent'):
+            fields['MostRecent'] = fields.pop('mostrecent')
+        return LoginUser(ID=ID, steam_path=steam_path, **fields)
+
+    @classmethod
+    def from_vdf(cls, users: dict, steam_path: Union[str, Path]) -> 'LoginUsers':
+        """
+        Build from the "users" section of loginusers.vdf.
+        """
+        return cls(cls._user(ID, steam_path, fields) for ID, fields in users.items())
+
+    @classmethod
+    def most_recent_only(cls, users: dict, steam_path: Union[str, Path]) -> 'LoginUsers':
+        """
+        Build from the "users" section of loginusers.vdf, constructing only the most recent user.
+        """
+        for ID, fields in users.items():
+            if (fields.get('MostRecent') or fields.get('mostrecent')) == TRUE:
+                return cls([cls._user(ID, steam_path, fields)])
+        return cls()
+
     def most_recent(self) -> LoginUser:
         for user in self:
             if user.MostRecent == TRUE:
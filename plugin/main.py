@@ -2,25 +2,45 @@
 import webbrowser
 
 from .steam import Steam, SteamLibraryNotFound, SteamExecutableNotFound
+from .matching import Matcher
 
 from flox import Flox, ICON_SETTINGS
-from flox.string_matcher import string_matcher, DEFAULT_QUERY_SEARCH_PRECISION, QUERY_SEARCH_PRECISION
 
 
 class SteamSearch(Flox):
-    
+
+    def __init__(self):
+        self._items = []
+        self._matcher = Matcher([])
+
+    def _load(self) -> Steam:
+        """
+        Read games and shortcuts and build their results once for this query.
+        Flow Launcher starts a fresh process per query, so nothing here outlives it;
+        only the on-disk caches (the icon database and the Uninstall index) carry over.
+        """
+        steam = Steam(self.settings.get('steam_path', None))
+        games = steam.all_games()
+        most_recent_user = steam.most_recent_user()
+        shortcuts = most_recent_user.shortcuts() if most_recent_user else []
+        self._items = [
+            self._result(shortcut.name, shortcut.unquoted_path(), shortcut.icon, shortcut.id)
+            for shortcut in shortcuts
+        ] + [
+            self._result(game['name'], game['path'], game['icon'], game['id'])
+            for game in games
+        ]
+        self._matcher = Matcher(item['title'] for item in self._items)
+        return steam
+
     def query(self, query):
         try:
-            self._steam = Steam(self.settings.get('steam_path', None))
+            steam = self._load()
             if not self.settings.get('steam_path'):
-                self.settings['steam_path'] = str(self._steam.path)
+                self.settings['steam_path'] = str(steam.path)
             debug = self.settings.get('debug', False)
             if debug:
                 self.logger_level = 'DEBUG'
-            games = self._steam.all_games()
-            users = self._steam.loginusers()
-            most_recent_user = users.most_recent() or users[0]
-            shortcuts = most_recent_user.shortcuts()
         except (SteamLibraryNotFound, SteamExecutableNotFound, FileNotFoundError):
             self.add_item(
                 title="Steam library not found!",
@@ -29,21 +49,27 @@ class SteamSearch(Flox):
                 icon=ICON_SETTINGS
             )
             return
-        for item in shortcuts + games:
-            query_search_precision = QUERY_SEARCH_PRECISION[self.query_search_precision]
-            match = string_matcher(query, item['name'], query_search_precision=query_search_precision or DEFAULT_QUERY_SEARCH_PRECISION)
-            if match.matched or (query == "" and self.settings.get('show_on_empty_search', False)):
-                icon = item.get('icon') or str(item['path'])
-                score = match.score
-                self.add_item(
-                    title=item['name'],
-                    subtitle=str(item['path']),
-                    icon=str(icon),
-                    method="launch_game",
-                    parameters=[item['id']],
-                    context=[item['id']],
-                    score=int(score)
-                )
+        if query == "":
+            if self.settings.get('show_on_empty_search', False):
+                for item in self._items:
+                    self.add_item(**item)
+            return
+        scores = self._matcher.scores(query, self.query_search_precision)
+        for index, score in scores.items():
+            self.add_item(**self._items[index], score=int(score))
+
+    @staticmethod
+    def _result(name, path, icon, game_id):
+        """Build the add_item() arguments for a game once, so queries only match and splat."""
+        game_id = str(game_id)
+        return dict(
+            title=name,
+            subtitle=str(path),
+            icon=str(icon or path),
+            method="launch_game",
+            parameters=[game_id],
+            context=[game_id]
+        )
 
     def context_menu(self, data):
         game_id = data[0]
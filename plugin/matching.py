@@ -0,0 +1,67 @@
+from typing import Dict, Iterable
+
+from flox.string_matcher import string_matcher, is_acronym, QUERY_SEARCH_PRECISION, DEFAULT_QUERY_SEARCH_PRECISION
+from rapidfuzz import process, fuzz, utils
+
+# Minimum RapidFuzz score for each of Flow Launcher's query search precision levels
+SCORE_CUTOFF = {
+    'Regular': 60,
+    'Low': 30,
+    'None': 0
+}
+DEFAULT_SCORE_CUTOFF = SCORE_CUTOFF['Regular']
+
+
+def _acronym(name: str) -> str:
+    """Return the lowercase characters Flow's string matcher treats as acronyms, e.g. "cs2" for "Counter-Strike 2"."""
+    return ''.join(char for index, char in enumerate(name) if is_acronym(name, index)).lower()
+
+
+def _in_order(needle: str, haystack: str) -> bool:
+    """Check whether all characters of needle appear in haystack in the same order."""
+    remaining = iter(haystack)
+    return all(char in remaining for char in needle)
+
+
+class Matcher:
+    """
+    Scores queries against a fixed list of titles.
+    Titles are normalised once, so each query is a single RapidFuzz pass plus an acronym pass.
+    """
+
+    def __init__(self, titles: Iterable[str]):
+        self.titles = list(titles)
+        self._names = [utils.default_process(title) for title in self.titles]
+        self._acronyms = [_acronym(title) for title in self.titles]
+
+    def scores(self, query: str, precision: str = 'Regular') -> Dict[int, float]:
+        """Return {title index: score} for every title matching the query."""
+        score_cutoff = SCORE_CUTOFF.get(precision, DEFAULT_SCORE_CUTOFF)
+        processed_query = utils.default_process(query)
+        words = processed_query.split()
+        matches = process.extract(
+            processed_query,
+            self._names,
+            scorer=fuzz.WRatio,
+            score_cutoff=score_cutoff,
+            limit=None
+        )
+        # WRatio lands short queries on the cutoff against unrelated names ("por" and Team Fortress 2),
+        # so a hit also needs each query word's characters in order in the name, as Flow's matcher does.
+        # This also drops scores of 0, which the 'None' precision would otherwise let through.
+        scores = {
+            index: score for _, score, index in matches
+            if score > 0 and all(_in_order(word, self._names[index]) for word in words)
+        }
+        # WRatio misses initials like "cs2" or "rdr2"; names whose acronym contains the query in order
+        # are scored by Flow's own matcher, the rest cannot be acronym matches and are skipped
+        acronym_query = query.strip().lower()
+        if acronym_query and ' ' not in acronym_query:
+            flow_precision = QUERY_SEARCH_PRECISION.get(precision, DEFAULT_QUERY_SEARCH_PRECISION)
+            for index, acronym in enumerate(self._acronyms):
+                if not _in_order(acronym_query, acronym):
+                    continue
+                match = string_matcher(query, self.titles[index], query_search_precision=flow_precision)
+                if match.matched and match.score >= score_cutoff and match.score > scores.get(index, 0):
+                    scores[index] = match.score
+        return scores
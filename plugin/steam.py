@@ -2,38 +2,336 @@ from pathlib import Path
 import logging
 import winreg as reg
 from winreg import HKEY_CURRENT_USER, HKEY_LOCAL_MACHINE, KEY_READ, KEY_WOW64_32KEY, KEY_WOW64_64KEY
-from typing import Union, Optional, Dict, List, Set
-import requests
-import tempfile
+from typing import Union, Optional, Dict, List, Tuple, FrozenSet, Iterator
+import ctypes
+from ctypes import wintypes
 import os
-from functools import lru_cache
 import pickle
-import hashlib
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import shutil
+import tempfile
+import queue
+import threading
+import time
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from .vdfs import VDF
 from .loginusers import LoginUsers, LoginUser
-from .library import Library
+from .library import Library, LibraryItem, LibraryImageDir
+from .icon_cache import IconCache, ICONS_DIR, CACHE_DIR
 from .exceptions import SteamLibraryNotFound, SteamExecutableNotFound
 
 STEAM_SUB_KEY = r'SOFTWARE\WOW6432Node\Valve\Steam'
 DEFAULT_STEAM_PATH = r"C:\Program Files (x86)\Steam"
 STEAM_EXE = "steam.exe"
-CACHE_FILE = "steam_icon_cache.pkl"
-CACHE_VERSION = 2  # Increment when cache format changes
+STEAM_UNINSTALL_PREFIX = "Steam App "
+UNINSTALL_KEYS = [
+    r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+    r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
+]
+REGISTRY_VIEWS = (KEY_WOW64_32KEY, KEY_WOW64_64KEY)
+# Uninstall values that may point at a game's icon, most common first
+ICON_VALUE_NAMES = ("DisplayIcon", "IconPath", "InstallIcon")
+# Icon files looked for in a game's InstallLocation, in order of preference ({game_id} is filled in)
+INSTALL_ICON_NAMES = tuple(
+    name + ext
+    for ext in ('.ico', '.png', '.jpg')
+    for name in ('icon', 'game', '{game_id}', 'steam_icon')
+)
+MAX_KEY_LENGTH = 256  # Registry key names are at most 255 characters
+ERROR_SUCCESS = 0
+ERROR_NO_MORE_ITEMS = 259
+UNINSTALL_CACHE = CACHE_DIR.joinpath('uninstall_index.pkl')
+UNINSTALL_CACHE_VERSION = 1  # Increment when cache format changes
+LIBRARY_WORKERS = 8
+ICON_WORKERS = 16
+ICON_CACHE_SIZE = 512
+CDN_POOL_SIZE = 32
+CDN_TIMEOUT = (1.0, 2.0)  # (connect, read) seconds
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_DEADLINE = 2.0  # Seconds a query waits for missing icons to download
+CDN_RETRY_TTL = 10 * 60  # Seconds before a game whose download failed is tried again
+STALE_PART_AGE = 10 * 60  # Seconds after which an unfinished download is considered abandoned
+LIBRARYCACHE_DIRS = [
+    ("appcache", "librarycache"),
+    ("steam", "appcache", "librarycache")
+]
+# Candidate librarycache images, in order of preference
+LIBRARYCACHE_ICON_SUFFIXES = ("_icon.jpg", "_library_600x900.jpg", ".jpg")
 
 logger = logging.getLogger(__name__)
 
+# Marks "not cached" where None is a meaningful cached value
+_UNSET = object()
+
+
+@lru_cache(maxsize=None)
+def _cdn_session():
+    """
+    Get the session shared by all CDN requests, so TLS connections are reused.
+    requests is imported here so queries that need no downloads never pay for it.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=CDN_POOL_SIZE,
+        pool_maxsize=CDN_POOL_SIZE,
+        max_retries=Retry(total=1, backoff_factor=0.1)
+    ))
+    return session
+
+
+_RegEnumKeyExW = ctypes.WinDLL('advapi32').RegEnumKeyExW
+_RegEnumKeyExW.argtypes = [
+    wintypes.HKEY, wintypes.DWORD, wintypes.LPWSTR, wintypes.LPDWORD,
+    wintypes.LPDWORD, wintypes.LPWSTR, wintypes.LPDWORD, ctypes.POINTER(wintypes.FILETIME)
+]
+_RegEnumKeyExW.restype = wintypes.LONG
+
+
+def _enum_subkeys(key: reg.HKEYType) -> Iterator[str]:
+    """
+    Enumerate subkey names of an open registry key.
+    Calls RegEnumKeyExW directly with one reused name buffer, avoiding
+    winreg.EnumKey's per-index RegQueryInfoKey and buffer allocation.
+    """
+    buffer = ctypes.create_unicode_buffer(MAX_KEY_LENGTH)
+    length = wintypes.DWORD()
+    index = 0
+    while True:
+        length.value = MAX_KEY_LENGTH
+        result = _RegEnumKeyExW(key.handle, index, buffer, ctypes.byref(length), None, None, None, None)
+        if result == ERROR_NO_MORE_ITEMS:
+            return
+        if result != ERROR_SUCCESS:
+            raise ctypes.WinError(result)
+        yield buffer.value
+        index += 1
+
+
+@lru_cache(maxsize=None)
+def _registry_steam_path() -> str:
+    """Get Steam path from registry, read once per process."""
+    try:
+        with reg.OpenKey(HKEY_LOCAL_MACHINE, STEAM_SUB_KEY) as hkey:
+            return reg.QueryValueEx(hkey, "InstallPath")[0]
+    except FileNotFoundError:
+        with reg.OpenKey(HKEY_CURRENT_USER, STEAM_SUB_KEY) as hkey:
+            return reg.QueryValueEx(hkey, "SteamPath")[0]
+
+
+# (last write time, names of "Steam App NNN" subkeys) per (view, Uninstall key), filled by _load_uninstall_index()
+_uninstall_index: Dict[Tuple[int, str], Tuple[int, FrozenSet[str]]] = {}
+_uninstall_index_lock = threading.Lock()
+
+
+def _uninstall_subkeys(
+    view: int,
+    base_path: str,
+    cached: Optional[Tuple[int, FrozenSet[str]]] = None,
+    seen: Optional[Dict[Tuple[int, int], Tuple[int, FrozenSet[str]]]] = None
+) -> Tuple[int, FrozenSet[str]]:
+    """
+    Get the last write time and names of all "Steam App NNN" subkeys of an Uninstall key.
+    `cached` is returned as-is when the key has not been written since it was scanned.
+    `seen` maps (last write time, subkey count) to results already produced in this pass:
+    the WOW64 redirector exposes the same 32-bit key under several view/path combinations,
+    and such duplicates are returned from there instead of being enumerated again.
+    """
+    names = set()
+    try:
+        with reg.OpenKey(HKEY_LOCAL_MACHINE, base_path, access=KEY_READ | view) as key:
+            subkey_count, _, last_write = reg.QueryInfoKey(key)
+            signature = (last_write, subkey_count)
+            if seen is not None and signature in seen:
+                return seen[signature]
+            if cached is not None and cached[0] == last_write:
+                result = cached
+            else:
+                for name in _enum_subkeys(key):
+                    # Only names are collected here; no subkey is ever opened during the scan
+                    if name.startswith(STEAM_UNINSTALL_PREFIX):
+                        names.add(name)
+                result = (last_write, frozenset(names))
+    except OSError:
+        return 0, frozenset()
+    if seen is not None:
+        seen[signature] = result
+    return result
+
+
+def _read_uninstall_cache() -> Dict[Tuple[int, str], Tuple[int, FrozenSet[str]]]:
+    """Load the Uninstall index saved by a previous run."""
+    try:
+        with open(UNINSTALL_CACHE, 'rb') as f:
+            data = pickle.load(f)
+        if isinstance(data, dict) and data.get('version') == UNINSTALL_CACHE_VERSION:
+            return data.get('index', {})
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Failed to load registry cache: {e}")
+    return {}
+
+
+def _write_uninstall_cache(index: Dict[Tuple[int, str], Tuple[int, FrozenSet[str]]]) -> None:
+    """
+    Save the Uninstall index for later runs.
+    Written to a temporary file and moved into place, since other query processes may be reading it.
+    """
+    part_file = None
+    try:
+        UNINSTALL_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'wb', dir=UNINSTALL_CACHE.parent, prefix=f"{UNINSTALL_CACHE.name}.", suffix='.part', delete=False
+        ) as f:
+            part_file = f.name
+            pickle.dump({'version': UNINSTALL_CACHE_VERSION, 'index': index}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(part_file, UNINSTALL_CACHE)
+    except Exception as e:
+        logger.warning(f"Failed to save registry cache: {e}")
+        if part_file is not None:
+            try:
+                os.remove(part_file)
+            except OSError:
+                pass
+
+
+def _load_uninstall_index() -> None:
+    """
+    Enumerate the Steam app subkeys of every Uninstall key once.
+    Started in the background by `Steam.__init__` and awaited before bulk
+    icon lookups, so games without an entry are rejected by a set lookup
+    instead of a failing OpenKey per view and key.
+    The result is saved to disk and reused by later runs for as long as
+    each key's last write time is unchanged.
+    """
+    with _uninstall_index_lock:
+        if _uninstall_index:
+            return
+        stored = _read_uninstall_cache()
+        seen = {}
+        for view in REGISTRY_VIEWS:
+            for base_path in UNINSTALL_KEYS:
+                key = (view, base_path)
+                _uninstall_index[key] = _uninstall_subkeys(view, base_path, stored.get(key), seen)
+        if _uninstall_index != stored:
+            _write_uninstall_cache(_uninstall_index)
+
+
+def _registry_icon_value(value: str) -> str:
+    """Strip an icon registry value of its icon index and quotes, expanding variables if present."""
+    # Values look like '"C:\path\game.exe",0'; keep the quoted path only
+    path = value.partition(",")[0].strip('"')
+    if "%" in path:
+        path = os.path.expandvars(path)
+    return path
+
+
+@lru_cache(maxsize=None)
+def _registry_icon_path(game_id: int) -> Optional[str]:
+    """
+    Get icon path for a game from its Uninstall registry entry.
+    Icon values of every view and key are checked before any install folder
+    is probed for icon files, since nearly all entries carry a DisplayIcon.
+    """
+    app_key = f"{STEAM_UNINSTALL_PREFIX}{game_id}"
+
+    tried = []
+    install_paths = []
+
+    for view in REGISTRY_VIEWS:
+        for base_path in UNINSTALL_KEYS:
+            # Once indexed, games without an Uninstall entry skip the OpenKey call entirely,
+            # and view/path combinations that resolve to an already tried key are skipped.
+            # Single lookups made before the background scan finishes open the key directly
+            # rather than waiting for it.
+            indexed = _uninstall_index.get((view, base_path))
+            if indexed is not None:
+                if app_key not in indexed[1] or any(indexed is other for other in tried):
+                    continue
+                tried.append(indexed)
+            try:
+                with reg.OpenKey(HKEY_LOCAL_MACHINE, f"{base_path}\\{app_key}",
+                                 access=KEY_READ | view) as key:
+                    for value_name in ICON_VALUE_NAMES:
+                        try:
+                            icon_path = _registry_icon_value(reg.QueryValueEx(key, value_name)[0])
+                        except OSError:
+                            continue
+                        if icon_path and os.path.exists(icon_path):
+                            return os.path.abspath(icon_path)
+                    # Remember the install folder for the fallback pass instead of reopening the key
+                    try:
+                        install_path, _ = reg.QueryValueEx(key, "InstallLocation")
+                    except OSError:
+                        continue
+                    if "%" in install_path:
+                        install_path = os.path.expandvars(install_path)
+                    if install_path and install_path not in install_paths:
+                        install_paths.append(install_path)
+            except OSError:
+                continue
+
+    # Fall back to well-known icon files in the install folders
+    for install_path in install_paths:
+        for file_name in INSTALL_ICON_NAMES:
+            path = os.path.join(install_path, file_name.format(game_id=game_id))
+            if os.path.exists(path):
+                return os.path.abspath(path)
+    return None
+
+
+@lru_cache(maxsize=None)
+def _prepare_icons_dir() -> None:
+    """
+    Create ICONS_DIR once per process, removing downloads that were abandoned
+    half-way, e.g. by a query process killed on the next keystroke.
+    """
+    ICONS_DIR.mkdir(parents=True, exist_ok=True)
+    cutoff = time.time() - STALE_PART_AGE
+    with os.scandir(ICONS_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.part'):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                continue
+
+
+def _mtime(path: Path) -> Optional[float]:
+    """Get modification time of a file, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
 class Steam:
     def __init__(self, path: Union[str, Path] = None):
         """
         Initialize Steam class with optional custom path.
         If no path is provided, tries to find Steam installation automatically.
         """
-        self._icon_cache: Dict[int, Optional[str]] = {}
-        self._library_cache: Optional[List[Library]] = None
+        self._icon_cache: "OrderedDict[int, Optional[str]]" = OrderedDict()
+        self._icon_cache_lock = threading.Lock()
+        self._icon_db: Optional[IconCache] = None
+        self._library_cache: Optional[Tuple[Optional[float], List[Library]]] = None
+        self._loginusers_cache: Optional[Tuple[Optional[float], LoginUsers]] = None
+        self._librarycache: Optional[Tuple[Tuple[Optional[float], ...], Dict[str, str]]] = None
+        self._librarycache_lock = threading.Lock()
+        self._library_image_dir: Optional[LibraryImageDir] = None
+        self._library_image_dir_lock = threading.Lock()
+        self._games_index: Optional[Tuple[List[Library], Dict[str, Dict[str, LibraryItem]]]] = None
+        self._user_index: Optional[Tuple[LoginUsers, Dict[str, LoginUser]]] = None
         self._loaded_cache = False
-        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._executor: Optional[ThreadPoolExecutor] = None
         
         if path is None:
             try:
@@ -47,49 +345,32 @@ class Steam:
             raise FileNotFoundError(f'Steam installation not found at: {self.path}')
         if not self.path.joinpath(STEAM_EXE).exists():
             raise SteamExecutableNotFound(self.path)
-            
-        self._load_icon_cache()
+        self._lc_dirs = [str(self.path.joinpath(*rel_path)) for rel_path in LIBRARYCACHE_DIRS]
+        # Only a valid installation gets an icon database and background work
+        self._icon_db = IconCache()
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        # Scan the Uninstall keys while the caller goes on to parse libraries and user files
+        self._uninstall_future = self._executor.submit(_load_uninstall_index)
 
     def __del__(self):
-        self._executor.shutdown(wait=False)
-        self._save_icon_cache()
+        # Either may be missing when __init__ rejected the Steam path
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        if self._icon_db is not None:
+            self._icon_db.close()
 
-    def _load_icon_cache(self):
-        """Load icon cache from disk with version checking."""
-        cache_path = Path(tempfile.gettempdir()) / CACHE_FILE
-        try:
-            if cache_path.exists():
-                with open(cache_path, 'rb') as f:
-                    data = pickle.load(f)
-                    if isinstance(data, dict) and data.get('version') == CACHE_VERSION:
-                        self._icon_cache = data.get('cache', {})
-                        logger.info(f"Loaded {len(self._icon_cache)} cached icons")
-        except Exception as e:
-            logger.warning(f"Failed to load icon cache: {e}")
-
-    def _save_icon_cache(self):
-        """Save icon cache to disk with versioning."""
-        if not self._icon_cache:
-            return
-            
-        cache_path = Path(tempfile.gettempdir()) / CACHE_FILE
-        try:
-            with open(cache_path, 'wb') as f:
-                pickle.dump({
-                    'version': CACHE_VERSION,
-                    'cache': self._icon_cache
-                }, f)
-        except Exception as e:
-            logger.warning(f"Failed to save icon cache: {e}")
+    def refresh(self) -> None:
+        """Discard cached libraries, games and users so they are re-read on next access."""
+        self._library_cache = None
+        self._loginusers_cache = None
+        self._librarycache = None
+        self._library_image_dir = None
+        self._games_index = None
+        self._user_index = None
 
     def from_registry(self) -> str:
         """Get Steam path from registry with multiple fallbacks."""
-        try:
-            with reg.OpenKey(HKEY_LOCAL_MACHINE, STEAM_SUB_KEY) as hkey:
-                return reg.QueryValueEx(hkey, "InstallPath")[0]
-        except FileNotFoundError:
-            with reg.OpenKey(HKEY_CURRENT_USER, STEAM_SUB_KEY) as hkey:
-                return reg.QueryValueEx(hkey, "SteamPath")[0]
+        return _registry_steam_path()
 
     def userdata(self, steamid: str) -> Path:
         """Get path to userdata folder for specific Steam user."""
@@ -103,31 +384,61 @@ class Steam:
         """Get path to Steam config folder."""
         return Path(self.path, 'config')
 
-    def loginusers(self) -> LoginUsers:
-        """Get all Steam users that have logged in on this machine."""
-        file_path = self.path.joinpath('config', 'loginusers.vdf')
+    def library_image_dir(self) -> LibraryImageDir:
+        """Get the librarycache image directory, shared by the games of every library."""
+        # Libraries are scanned by one worker per drive; only the first one creates it
+        with self._library_image_dir_lock:
+            if self._library_image_dir is None:
+                self._library_image_dir = LibraryImageDir(self.path.joinpath('appcache', 'librarycache'))
+            return self._library_image_dir
+
+    def loginusers_path(self) -> Path:
+        """Get path to the loginusers.vdf manifest."""
+        return self.path.joinpath('config', 'loginusers.vdf')
+
+    def libraryfolders_path(self) -> Path:
+        """Get path to the libraryfolders.vdf manifest."""
+        return self.path.joinpath('steamapps', 'libraryfolders.vdf')
+
+    def loginusers(self, only_most_recent: bool = False) -> LoginUsers:
+        """
+        Get all Steam users that have logged in on this machine (cached until loginusers.vdf changes).
+        With `only_most_recent`, only the most recent user is constructed and returned.
+        """
+        file_path = self.loginusers_path()
+        mtime = _mtime(file_path)
+        if self._loginusers_cache is not None and self._loginusers_cache[0] == mtime:
+            loginusers = self._loginusers_cache[1]
+            if only_most_recent:
+                most_recent = loginusers.most_recent()
+                return LoginUsers([most_recent] if most_recent else [])
+            return loginusers
+
         vdf = VDF(file_path)
-        loginusers = LoginUsers()
-        
-        for user in vdf['users']:
-            if vdf['users'][user].get('mostrecent'):
-                vdf['users'][user]['MostRecent'] = vdf['users'][user].pop('mostrecent')
-                
-            loginusers.append(
-                LoginUser(ID=user, steam_path=self.path, **vdf['users'][user])
-            )
+        if only_most_recent:
+            return LoginUsers.most_recent_only(vdf['users'], self.path)
+        loginusers = LoginUsers.from_vdf(vdf['users'], self.path)
+        self._loginusers_cache = (mtime, loginusers)
         return loginusers
 
     def user(self, username: str) -> LoginUser:
-        """Get Steam user by username."""
-        for user in self.loginusers():
-            if user.username == username:
-                return user
-        raise KeyError(f'Could not find Steam user with username: {username}')
+        """Get Steam user by username (account name)."""
+        user = self.try_user(username)
+        if user is None:
+            raise KeyError(f'Could not find Steam user with username: {username}')
+        return user
+
+    def try_user(self, username: str) -> Optional[LoginUser]:
+        """Like `user`, but return None instead of raising when no such user has logged in."""
+        loginusers = self.loginusers()
+        if self._user_index is None or self._user_index[0] is not loginusers:
+            self._user_index = (loginusers, {user.AccountName: user for user in loginusers})
+        return self._user_index[1].get(username)
 
-    def most_recent_user(self) -> LoginUser:
-        """Get the most recently logged in Steam user."""
-        return self.loginusers().most_recent()
+    def most_recent_user(self) -> Optional[LoginUser]:
+        """Get the most recently logged in Steam user, falling back to the first known user."""
+        users = self.loginusers(only_most_recent=True) or self.loginusers()
+        return users[0] if users else None
 
     def all_shortcuts(self) -> List[Dict]:
         """Get all Steam shortcuts from all users."""
@@ -136,191 +447,311 @@ class Steam:
             shortcuts.extend(user.shortcuts())
         return shortcuts
 
-    @lru_cache(maxsize=512)
     def get_game_icon(self, game_id: int) -> Optional[str]:
         """
         Get game icon with optimized lookup and caching.
         Priority:
         1. Memory cache
-        2. Registry lookup (optimized)
-        3. Local Steam files
-        4. CDN download (async)
+        2. Persistent icon cache
+        3. Registry lookup (optimized)
+        4. Local Steam files
+        5. CDN download (blocking)
         """
-        # Check memory cache first
-        if game_id in self._icon_cache:
-            cached = self._icon_cache[game_id]
-            if cached and os.path.exists(cached):
-                return cached
-            if cached is None: 
-                return None
-
-        # Try registry first (fastest)
-        icon_path = self._get_registry_icon_path(game_id)
+        if self._cached_icon(game_id, _UNSET) is None:
+            return None
+
+        icon_path = self._get_known_icon(game_id)
         if icon_path:
-            self._icon_cache[game_id] = icon_path
             return icon_path
 
-        # Then check local Steam files
-        icon_path = self._get_local_icon_path(game_id)
+        # Finally try CDN, on this thread: a caller waiting for the result gains nothing from a hop
+        return self._get_cdn_icon(game_id)
+
+    def _get_cdn_icon(self, game_id: int) -> Optional[str]:
+        """Download a game icon from the CDN, remembering the result either way."""
+        try:
+            icon_path = self._download_icon(game_id)
+        except OSError as e:
+            logger.debug(f"cdn icon lookup failed for game {game_id}: {e}")
+            return None
         if icon_path:
+            return self._remember_icon(game_id, icon_path, 'cdn')
+        self._cache_icon(game_id, None)
+        return None
+
+    def _get_known_icon(self, game_id: int) -> Optional[str]:
+        """Get game icon from caches, registry or local files, without touching the network."""
+        # Check memory cache first
+        cached = self._cached_icon(game_id)
+        if cached and os.path.exists(cached):
+            return cached
+
+        # Then icons resolved by a previous run
+        icon_path = self._icon_db.get(game_id)
+        if icon_path:
+            return self._cache_icon(game_id, icon_path)
+
+        # Try registry first (fastest), then local Steam files; a failing source falls through to the next
+        for source, lookup in (('registry', self._get_registry_icon_path), ('local', self._get_local_icon_path)):
+            try:
+                icon_path = lookup(game_id)
+            except OSError as e:
+                logger.debug(f"{source} icon lookup failed for game {game_id}: {e}")
+                continue
+            if icon_path:
+                return self._remember_icon(game_id, icon_path, source)
+        return None
+
+    def _download_icons(self, game_ids: List[int]) -> Dict[int, str]:
+        """
+        Download missing icons on daemon threads and return those found within DOWNLOAD_DEADLINE.
+        The deadline bounds the query: downloads still running then are abandoned with the process
+        (Flow Launcher starts one per query), and ones not yet started are skipped.
+        """
+        if not game_ids:
+            return {}
+        todo: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+        for game_id in game_ids:
+            todo.put(game_id)
+        results: "queue.SimpleQueue[Tuple[int, Optional[str]]]" = queue.SimpleQueue()
+        expired = threading.Event()
+
+        def worker() -> None:
+            while not expired.is_set():
+                try:
+                    game_id = todo.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    icon_path = self._get_cdn_icon(game_id)
+                except Exception as e:
+                    logger.warning(f"Failed to download icon for game {game_id}: {e}")
+                    icon_path = None
+                results.put((game_id, icon_path))
+
+        # Daemon threads, unlike executor workers, do not hold up interpreter exit past the deadline
+        for _ in range(min(ICON_WORKERS, len(game_ids))):
+            threading.Thread(target=worker, daemon=True).start()
+
+        icons = {}
+        deadline = time.monotonic() + DOWNLOAD_DEADLINE
+        for _ in game_ids:
+            try:
+                game_id, icon_path = results.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if icon_path:
+                icons[game_id] = icon_path
+        expired.set()
+        return icons
+
+    def _cached_icon(self, game_id: int, default=None):
+        """Get an icon from the in-memory LRU cache, marking it recently used."""
+        with self._icon_cache_lock:
+            if game_id not in self._icon_cache:
+                return default
+            self._icon_cache.move_to_end(game_id)
+            return self._icon_cache[game_id]
+
+    def _cache_icon(self, game_id: int, icon_path: Optional[str]) -> Optional[str]:
+        """Store an icon (or None for "no icon") in the in-memory LRU cache."""
+        with self._icon_cache_lock:
             self._icon_cache[game_id] = icon_path
-            return icon_path
+            self._icon_cache.move_to_end(game_id)
+            if len(self._icon_cache) > ICON_CACHE_SIZE:
+                self._icon_cache.popitem(last=False)
+        return icon_path
 
-        # Finally try CDN (async)
-        future = self._executor.submit(self._download_icon, game_id)
-        icon_path = future.result()  
-        self._icon_cache[game_id] = icon_path
+    def _remember_icon(self, game_id: int, icon_path: str, source: str) -> str:
+        """Store a resolved icon in the memory and persistent caches."""
+        self._cache_icon(game_id, icon_path)
+        self._icon_db.put(game_id, icon_path, source)
         return icon_path
 
     def _get_registry_icon_path(self, game_id: int) -> Optional[str]:
-        """Optimized registry lookup with multiple key attempts."""
-        app_key = f"Steam App {game_id}"
-        registry_paths = [
-            r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
-            r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
-        ]
-        
-        # Try different registry views
-        for view in [KEY_WOW64_32KEY, KEY_WOW64_64KEY]:
-            for base_path in registry_paths:
-                try:
-                    with reg.OpenKey(HKEY_LOCAL_MACHINE, f"{base_path}\\{app_key}", 
-                                   access=KEY_READ | view) as key:
-                        
-                        # Check common value names
-                        for value_name in ["DisplayIcon", "IconPath", "InstallIcon"]:
-                            try:
-                                icon_path, _ = reg.QueryValueEx(key, value_name)
-                                if "," in icon_path:
-                                    icon_path = icon_path.split(",")[0]
-                                icon_path = os.path.expandvars(icon_path)
-                                if os.path.exists(icon_path):
-                                    return os.path.abspath(icon_path)
-                            except (FileNotFoundError, OSError):
-                                continue
-
-                        # Try InstallLocation fallback
-                        try:
-                            install_path, _ = reg.QueryValueEx(key, "InstallLocation")
-                            if install_path:
-                                install_path = os.path.expandvars(install_path)
-                                for ext in ['.ico', '.png', '.jpg']:
-                                    for name in ['icon', 'game', f'{game_id}', 'steam_icon']:
-                                        path = os.path.join(install_path, name + ext)
-                                        if os.path.exists(path):
-                                            return os.path.abspath(path)
-                        except (FileNotFoundError, OSError):
-                            continue
-                except (FileNotFoundError, OSError):
+        """
+        Optimized registry lookup with multiple key attempts.
+        Does not wait for the Uninstall index: until it is loaded, keys are opened directly.
+        """
+        return _registry_icon_path(game_id)
+
+    def _wait_for_uninstall_index(self) -> None:
+        """Block until the Uninstall index started by `__init__` is loaded, ahead of bulk lookups."""
+        self._uninstall_future.result()
+
+    def _librarycache_index(self) -> Dict[str, str]:
+        """
+        Index the librarycache folders as {filename: path} with one scandir each.
+        Rebuilt only when a folder's mtime changes; the first folder wins on duplicates.
+        """
+        cache_dirs = self._lc_dirs
+        mtimes = tuple(_mtime(cache_dir) for cache_dir in cache_dirs)
+        if self._librarycache is not None and self._librarycache[0] == mtimes:
+            return self._librarycache[1]
+
+        # Icon workers call this concurrently; only the first one scans
+        with self._librarycache_lock:
+            if self._librarycache is not None and self._librarycache[0] == mtimes:
+                return self._librarycache[1]
+            index = {}
+            for cache_dir, mtime in reversed(list(zip(cache_dirs, mtimes))):
+                if mtime is None:
                     continue
-        return None
+                try:
+                    with os.scandir(cache_dir) as entries:
+                        for entry in entries:
+                            index[entry.name] = entry.path
+                except OSError as e:
+                    logger.debug(f"Failed to scan {cache_dir}: {e}")
+            self._librarycache = (mtimes, index)
+            return index
 
     def _get_local_icon_path(self, game_id: int) -> Optional[str]:
-        """Optimized local file lookup with path caching."""
-        cache_dirs = [
-            ("appcache", "librarycache"),
-            ("steam", "appcache", "librarycache")
-        ]
-        
-        for rel_path in cache_dirs:
-            cache_dir = self.path.joinpath(*rel_path)
-            if not cache_dir.exists():
-                continue
-                
-            for pattern in [f"{game_id}_icon.jpg", f"{game_id}_library_600x900.jpg", f"{game_id}.jpg"]:
-                icon_path = cache_dir / pattern
-                if icon_path.exists():
-                    return str(icon_path)
-        return None
+        """Local file lookup against the librarycache index."""
+        index = self._librarycache_index()
+        return next(filter(None, (index.get(f"{game_id}{suffix}") for suffix in LIBRARYCACHE_ICON_SUFFIXES)), None)
+
+    def _probe_icon_url(self, url: str) -> Optional[int]:
+        """Get the HTTP status of a CDN image without downloading it, or None if unreachable."""
+        from requests import RequestException
+        try:
+            return _cdn_session().head(url, timeout=CDN_TIMEOUT, allow_redirects=True).status_code
+        except RequestException:
+            return None
 
     def _download_icon(self, game_id: int) -> Optional[str]:
-        """Optimized CDN download with caching."""
+        """
+        Optimized CDN download with caching.
+        A previously downloaded icon is returned without touching the network.
+        Candidate URLs are probed with HEAD in order of preference, and the
+        first one that exists is downloaded. Games whose images all 404 are
+        remembered in the icon cache and not probed again until it expires;
+        network failures are remembered for CDN_RETRY_TTL.
+        """
+        from requests import RequestException
+        from urllib3.exceptions import HTTPError as TransportError
+
+        # Stable per-game filename so downloads survive restarts
+        cache_file = ICONS_DIR / f"{game_id}.jpg"
+        if cache_file.exists():
+            return str(cache_file)
+        if self._icon_db.is_missing(game_id):
+            return None
         cdn_urls = [
             f"https://cdn.cloudflare.steamstatic.com/steam/apps/{game_id}/library_600x900.jpg",
             f"https://media.steampowered.com/steamcommunity/public/images/apps/{game_id}/{game_id}.jpg"
         ]
-        
+        # Probe in order of preference; the first image that exists is the one downloaded
+        statuses = []
         for url in cdn_urls:
+            statuses.append(self._probe_icon_url(url))
+            if statuses[-1] == 200:
+                break
+        if all(status == 404 for status in statuses):
+            self._icon_db.put_missing(game_id, 'cdn')
+            return None
+
+        for url, status in zip(cdn_urls, statuses):
+            if status != 200:
+                continue
             try:
-                response = requests.get(url, timeout=3, stream=True)
-                if response.status_code == 200:
-                    cache_dir = Path(tempfile.gettempdir()) / "steam_icons"
-                    cache_dir.mkdir(exist_ok=True)
-                    
-                    # Create consistent filename based on URL hash
-                    url_hash = hashlib.md5(url.encode()).hexdigest()
-                    ext = os.path.splitext(url)[1] or '.jpg'
-                    cache_file = cache_dir / f"{game_id}_{url_hash}{ext}"
-                    
-                    if not cache_file.exists():
-                        with open(cache_file, 'wb') as f:
-                            for chunk in response.iter_content(1024):
-                                f.write(chunk)
-                    
+                # Closing the streamed response hands its connection back to the pool on every path
+                with _cdn_session().get(url, timeout=CDN_TIMEOUT, stream=True) as response:
+                    if response.status_code != 200:
+                        continue
+                    _prepare_icons_dir()
+                    # Write to a side file of this download's own first, so neither a partial download
+                    # nor one racing it for the same game is ever picked up as the icon
+                    with tempfile.NamedTemporaryFile(
+                        'wb', dir=ICONS_DIR, prefix=f"{game_id}.", suffix='.part', delete=False
+                    ) as f:
+                        part_file = f.name
+                        try:
+                            response.raw.decode_content = True
+                            shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_SIZE)
+                        except BaseException:
+                            f.close()
+                            os.remove(part_file)
+                            raise
+                    try:
+                        os.replace(part_file, cache_file)
+                    except OSError:
+                        # Windows refuses to replace an icon that is open elsewhere; keep the one already there
+                        os.remove(part_file)
+                        if not cache_file.exists():
+                            raise
                     return str(cache_file)
-            except requests.RequestException:
+            except (RequestException, TransportError):
+                # Reading response.raw directly surfaces urllib3 errors that iter_content used to wrap
                 continue
+        # Unreachable or failing CDN: retry after a short while rather than on every keystroke
+        self._icon_db.put_missing(game_id, 'cdn', ttl=CDN_RETRY_TTL)
         return None
 
-    def all_games(self) -> List[Dict]:
-        """Get all games with parallel icon prefetching."""
-        games = []
-        game_ids = set()
-        
-        # First collect all games
+    def _scan_libraries(self) -> List[LibraryItem]:
+        """
+        Scan all libraries concurrently.
+        Libraries are grouped per drive so each disk is read by a single worker.
+        """
+        drives: Dict[str, List[Library]] = {}
         for library in self.libraries():
-            for game in library.games():
-                games.append({
-                    'id': game.id,
-                    'name': game.name,
-                    'path': game.path,
-                    'icon': None 
-                })
-                game_ids.add(int(game.id))
-        
-        # Prefetch icons in parallel
-        futures = {
-            self._executor.submit(self.get_game_icon, game_id): game_id
-            for game_id in game_ids
-        }
-        
-        # Map game IDs to their icon paths
-        icon_map = {}
-        for future in as_completed(futures):
-            game_id = futures[future]
-            try:
-                icon_map[game_id] = future.result()
-            except Exception as e:
-                logger.warning(f"Failed to get icon for game {game_id}: {e}")
-                icon_map[game_id] = None
-        
-        # Update games with icons
-        for game in games:
-            game['icon'] = icon_map.get(int(game['id']), game['path'])
-        
-        return games
+            drives.setdefault(Path(library.path).drive, []).append(library)
+
+        def scan_drive(libraries: List[Library]) -> List[LibraryItem]:
+            return [game for library in libraries for game in library.games()]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(LIBRARY_WORKERS, len(drives)))) as executor:
+            return [game for games in executor.map(scan_drive, drives.values()) for game in games]
+
+    def _try_known_icon(self, game_id: int) -> Optional[str]:
+        """Get a locally known game icon, logging instead of raising on failure."""
+        try:
+            return self._get_known_icon(game_id)
+        except Exception as e:
+            logger.warning(f"Failed to get icon for game {game_id}: {e}")
+            return None
+
+    def all_games(self) -> List[Dict]:
+        """
+        Get all games, scanning libraries and resolving icons in parallel.
+        Icons that are not available locally are downloaded for up to
+        DOWNLOAD_DEADLINE seconds; slower ones are picked up by a later query.
+        """
+        games = self._scan_libraries()
+        game_ids = list(dict.fromkeys(int(game.id) for game in games))
+
+        self._wait_for_uninstall_index()
+        with ThreadPoolExecutor(max_workers=ICON_WORKERS) as executor:
+            icon_map = dict(zip(game_ids, executor.map(self._try_known_icon, game_ids)))
+        icon_map.update(self._download_icons([game_id for game_id, icon in icon_map.items() if icon is None]))
+        self._icon_db.flush()
+
+        return [
+            {
+                'id': game.id,
+                'name': game.name,
+                'path': game.path,
+                'icon': icon_map.get(int(game.id), game.path)
+            }
+            for game in games
+        ]
 
     def libraries(self) -> List[Library]:
-        """Get libraries with caching."""
-        if self._library_cache is not None:
-            return self._library_cache
+        """Get libraries with caching (invalidated when libraryfolders.vdf changes)."""
+        manifest_path = self.libraryfolders_path()
+        mtime = _mtime(manifest_path)
+        if mtime is None:
+            raise SteamLibraryNotFound(manifest_path)
+        if self._library_cache is not None and self._library_cache[0] == mtime:
+            return self._library_cache[1]
             
         libraries = []
-        manifest_path = self.path.joinpath('steamapps', 'libraryfolders.vdf')
-        
-        if not manifest_path.exists():
-            raise SteamLibraryNotFound(manifest_path)
             
         try:
-            library_folders = VDF(manifest_path)
-            libraries_key = 'libraryfolders' if 'libraryfolders' in library_folders else 'LibraryFolders'
-            
-            for key, value in library_folders[libraries_key].items():
-                if key.isdigit():
-                    path = value.get('path', value) if isinstance(value, dict) else value
-                    libraries.append(Library(self, path))
+            for path in VDF.stream_library_folders(manifest_path):
+                libraries.append(Library(self, path))
                     
-            self._library_cache = libraries
+            self._library_cache = (mtime, libraries)
             return libraries
         except Exception as e:
             logger.error(f"Failed to load libraries: {e}")
@@ -340,17 +771,49 @@ class Steam:
         Raises:
             KeyError: If game not found
         """
-        for library in self.libraries():
-            for game in library.games():
-                if (name and game.name.lower() == name.lower()) or (id and game.id == id):
-                    return {
-                        'id': game.id,
-                        'name': game.name,
-                        'path': game.path,
-                        'icon': self.get_game_icon(game.id)
-                    }
-        raise KeyError(f'Could not find Steam game with name: {name} or ID: {id}')
+        game = self.try_game(name, id)
+        if game is None:
+            raise KeyError(f'Could not find Steam game with name: {name} or ID: {id}')
+        return game
 
+    def try_game(self, name: str = None, id: int = None) -> Optional[Dict]:
+        """Like `game`, but return None instead of raising when the game is not installed."""
+        game = self._find_game(name, id)
+        if game is None:
+            return None
+        return {
+            'id': game.id,
+            'name': game.name,
+            'path': game.path,
+            'icon': self.get_game_icon(int(game.id))
+        }
+
+    def _find_game(self, name: str = None, id: int = None) -> Optional[LibraryItem]:
+        """Look up an installed game by name, then by ID."""
+        index = self._game_index()
+        game = None
+        if name:
+            game = index['by_name'].get(name.lower())
+        if game is None and id:
+            game = index['by_id'].get(str(id))
+        return game
+
+    def _game_index(self) -> Dict[str, Dict[str, LibraryItem]]:
+        """
+        Get installed games indexed by lowercase name and by ID.
+        Rebuilt whenever libraries() returns a new set of libraries.
+        """
+        libraries = self.libraries()
+        if self._games_index is None or self._games_index[0] is not libraries:
+            by_name: Dict[str, LibraryItem] = {}
+            by_id: Dict[str, LibraryItem] = {}
+            for library in libraries:
+                for game in library.games():
+                    # First match wins, as with the previous linear scan
+                    by_name.setdefault(game.name.lower(), game)
+                    by_id.setdefault(str(game.id), game)
+            self._games_index = (libraries, {'by_name': by_name, 'by_id': by_id})
+        return self._games_index[1]
 
 if __name__ == '__main__':
     steam = Steam()
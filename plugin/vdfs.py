@@ -1,8 +1,18 @@
+import os
+import re
+import mmap
 from pathlib import Path
-from typing import Union
+from typing import Union, Dict, Tuple, Iterator
 
 import vdf
 
+# Quoted strings (with backslash escapes) and braces of a text VDF
+_TOKEN = re.compile(rb'"((?:[^"\\]|\\.)*)"|([{}])')
+_ESCAPE = re.compile(rb'\\(.)')
+
+# Parsed files keyed by (parser, path), reused while the file's mtime is unchanged
+_parse_cache: Dict[Tuple[str, Path], Tuple[float, dict]] = {}
+
 
 class VDF(dict):
     """
@@ -11,9 +21,63 @@ class VDF(dict):
 
     def __init__(self, file: Union[str, Path]) -> None:
         self.file = Path(file)
-        self._data = self._load()
+        self._data = self._cached_load()
         super(VDF, self).__init__(self._data)
 
+    def _cached_load(self):
+        key = (type(self).__name__, self.file)
+        mtime = self.file.stat().st_mtime
+        cached = _parse_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        data = self._load()
+        _parse_cache[key] = (mtime, data)
+        return data
+
     def _load(self):
         with open(self.file, 'r', encoding='utf-8', errors='ignore') as f:
             return vdf.load(f)
+
+    @staticmethod
+    def stream_library_folders(file: Union[str, Path]) -> Iterator[str]:
+        """
+        Yield library paths from a libraryfolders.vdf without building the full tree.
+        Supports both the current layout ("0" { "path" "D:\\Library" ... })
+        and the legacy one ("1" "D:\\Library").
+        """
+        with open(file, 'rb') as f:
+            data = f.read()
+        depth = 0
+        key = None
+        entry = None
+        for match in _TOKEN.finditer(data):
+            string, brace = match.groups()
+            if brace == b'{':
+                depth += 1
+                if depth == 2:
+                    entry = key
+                key = None
+            elif brace == b'}':
+                depth -= 1
+                key = None
+            elif key is None:
+                key = string
+            else:
+                # Only numbered library entries carry paths; "apps", sizes etc. are skipped over
+                if (depth == 1 and key.isdigit()) or (depth == 2 and key == b'path' and entry.isdigit()):
+                    yield _ESCAPE.sub(rb'\1', string).decode('utf-8', errors='ignore')
+                key = None
+
+
+class BinaryVDF(VDF):
+    """
+    Represents a binary VDF file used by Steam (e.g. shortcuts.vdf).
+    """
+
+    def _load(self):
+        # Parse straight from a read-only memory map rather than copying the file into bytes
+        with open(self.file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return {}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return vdf.binary_load(mm)
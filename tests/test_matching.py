@@ -0,0 +1,47 @@
+import unittest
+
+from plugin.matching import Matcher
+
+LIBRARY = [
+    "Counter-Strike 2",
+    "Team Fortress 2",
+    "Portal 2",
+    "Red Dead Redemption 2",
+    "Grand Theft Auto V",
+    "Half-Life",
+    "Dota 2",
+    "Hades",
+    "Stardew Valley",
+]
+
+
+class MatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = Matcher(LIBRARY)
+
+    def ranked(self, query, precision='Regular'):
+        scores = self.matcher.scores(query, precision)
+        return [LIBRARY[index] for index in sorted(scores, key=scores.get, reverse=True)]
+
+    def test_short_queries_skip_unrelated_names(self):
+        self.assertEqual(self.ranked('por'), ["Portal 2"])
+        self.assertEqual(set(self.ranked('st')), {"Counter-Strike 2", "Stardew Valley"})
+        self.assertEqual(self.ranked('gta'), ["Grand Theft Auto V"])
+
+    def test_acronyms(self):
+        for query, title in [('tf2', "Team Fortress 2"), ('rdr2', "Red Dead Redemption 2"),
+                             ('cs2', "Counter-Strike 2"), ('gta', "Grand Theft Auto V")]:
+            with self.subTest(query=query):
+                self.assertEqual(self.ranked(query)[0], title)
+
+    def test_full_names(self):
+        self.assertEqual(self.ranked('portal')[0], "Portal 2")
+        self.assertEqual(self.ranked('counter strike')[0], "Counter-Strike 2")
+
+    def test_no_precision_drops_unrelated_names(self):
+        self.assertEqual(self.ranked('zzzz', precision='None'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()